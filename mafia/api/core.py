@@ -4,19 +4,25 @@ Includes a 'database' of sorts and authorization functions.
 Also includes a derived Game class that adds extra fields for API use.
 """
 
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from itertools import count
 from secrets import token_urlsafe
-from typing import Any
+from threading import RLock
+from typing import Any, TypeVar, cast
 
+from flask import request
 from werkzeug.datastructures import Headers
 
+from mafia.core import Ability, Alignment, Player, Visit
 from mafia.core import ChatMessage as BaseChatMessage
-from mafia.core import Player, Visit
 from mafia.normal import Game as BaseGame
 from mafia.normal import Resolver
 
+T = TypeVar("T")
+
 
 class Game(BaseGame):
     """A game of Mafia with extra fields for API use."""
@@ -26,11 +32,78 @@ class Game(BaseGame):
         if mod_token is None:
             mod_token = token_urlsafe(16)
         self.mod_token = mod_token
-        self.queued_visits: list[Visit] = []
+        # Used as an ordered set, so that queued visits can be removed in O(1).
+        self.queued_visits: dict[Visit, None] = {}
+        # Indexes of the queued visits, kept up to date by queue_visit and unqueue_visit.
+        self.queued_by_actor_ability: dict[tuple[Player, Ability], Visit] = {}
+        self.queued_by_ability_alignment: dict[tuple[Ability, Alignment], Visit] = {}
+        self.players_by_name: dict[str, Player] = {}
+        # Incremented by bump_version whenever the game may have changed.
+        self.version = 0
+        self.response_cache: dict[Hashable, tuple[int, Any]] = {}
+        # Held by requests that modify the game, so that concurrent writes to the same
+        # game do not interleave. Reads and other games are not blocked.
+        self.lock = RLock()
+
+    def bump_version(self) -> None:
+        """Invalidate the cached values of the game."""
+        self.version += 1
+        self.response_cache.clear()
+
+    def cached(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Get a value cached for the current game version, building it if needed.
+
+        Requests that may modify the game bump its version when they finish (see
+        `request_lock`). Code that changes the game outside of such a request must call
+        `bump_version` itself, or cached values will not reflect the change.
+        """
+        version = self.version
+        entry = self.response_cache.get(key)
+        if entry is not None and entry[0] == version:
+            return cast("T", entry[1])
+        value = build()
+        self.response_cache[key] = (version, value)
+        return value
+
+    def add_player(self, *players: Player) -> None:
+        super().add_player(*players)
+        for player in players:
+            # Keep the first player with a given name, like a linear search would.
+            self.players_by_name.setdefault(player.name, player)
+
+    def queue_visit(self, visit: Visit) -> None:
+        """Queue a visit to be performed when the queued visits are dequeued."""
+        self.queued_visits[visit] = None
+        self.queued_by_actor_ability[visit.actor, visit.ability] = visit
+        self.queued_by_ability_alignment[visit.ability, visit.actor.alignment] = visit
+
+    def unqueue_visit(self, visit: Visit) -> None:
+        """Remove a queued visit."""
+        del self.queued_visits[visit]
+        if self.queued_by_actor_ability.get((visit.actor, visit.ability)) is visit:
+            del self.queued_by_actor_ability[visit.actor, visit.ability]
+        key = visit.ability, visit.actor.alignment
+        if self.queued_by_ability_alignment.get(key) is visit:
+            del self.queued_by_ability_alignment[key]
+
+    def clear_queued_visits(self) -> None:
+        """Remove all queued visits."""
+        self.queued_visits.clear()
+        self.queued_by_actor_ability.clear()
+        self.queued_by_ability_alignment.clear()
+
+    def dequeue_visits(self) -> None:
+        """Move the queued visits that can be performed now into the game's visits."""
+        self.visits.extend(
+            v
+            for v in self.queued_visits
+            if v.is_active_time(self) and v.ability.check(self, v.actor, v.targets)
+        )
+        self.clear_queued_visits()
 
     def advance_phase(self) -> tuple[int, Any]:
         result = super().advance_phase()
-        self.queued_visits.clear()
+        self.clear_queued_visits()
         return result
 
 
@@ -44,13 +117,49 @@ class ChatMessage(BaseChatMessage):
 resolver = Resolver()
 
 
+def valid_target_names(game: Game, player: Player, ability: Ability) -> list[list[str]]:
+    """Get the names of the valid targets of an ability, cached until the game changes."""
+    if ability.target_count <= 0:
+        return []
+    return game.cached(
+        ("valid_targets", ability, player),
+        lambda: [
+            [t.name for t in targets] for targets in ability.valid_targets(game, player)
+        ],
+    )
+
+
 def get_permissions(game: Game, headers: Headers) -> tuple[str | None, Player | None]:
     """Get the moderator token and player from the headers."""
     mod_token: str | None = headers.get("Authorization-Mod-Token")
     player_name: str | None = headers.get("Authorization-Player-Name")
-    player: Player | None = next((p for p in game.players if p.name == player_name), None)
+    player: Player | None = (
+        game.players_by_name.get(player_name) if player_name is not None else None
+    )
     return mod_token, player
 
 
 games: dict[int, Game] = {}
 game_count = count(0)
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# The most messages returned in one page, so that a request cannot copy a whole chat.
+MAX_MESSAGE_LIMIT = 200
+
+
+@contextmanager
+def request_lock(game: Game) -> Iterator[None]:
+    """Hold the game's lock while handling the current request to it.
+
+    Requests that may modify the game hold the game's lock, and bump its version before
+    releasing it, even if the request fails partway. Read-only requests hold nothing.
+    """
+    if request.method in READ_ONLY_METHODS:
+        yield
+        return
+    with game.lock:
+        try:
+            yield
+        finally:
+            game.bump_version()
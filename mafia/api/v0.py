@@ -8,31 +8,227 @@ from __future__ import annotations
 
 import random
 import re
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Hashable
+from functools import lru_cache, wraps
+from inspect import signature
+from typing import Any, Literal
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, jsonify, request
 from markupsafe import Markup, escape
+from werkzeug.http import generate_etag
 
 from mafia import core, normal
-from mafia.api.core import ChatMessage, Game, game_count, games, get_permissions, resolver
+from mafia.api.core import (
+    MAX_MESSAGE_LIMIT,
+    ChatMessage,
+    Game,
+    game_count,
+    games,
+    get_permissions,
+    request_lock,
+    resolver,
+    valid_target_names,
+)
 
 # HELPER FUNCTIONS #
 
+WHITESPACE = re.compile(r"\s")
+
 
 def slugify(obj: object) -> str:
     """Convert spaces to dashes."""
-    return re.sub(r"\s", "-", str(obj))
+    return WHITESPACE.sub("-", str(obj))
 
 
-def role(player: core.Player) -> Markup:
-    """Get the role name of a player as HTML."""
+@lru_cache(maxsize=512)
+def role_html(alignment_id: str, role_name: str) -> Markup:
+    """Get a role name as HTML, cached as there are few distinct roles in use."""
     return Markup(  # noqa: S704  # Markup is safe
-        f'<span class="role_name Alignment-{slugify(escape(player.alignment))}">'
-        f"{escape(player.role_name)}</span>",
+        f'<span class="role_name Alignment-{slugify(escape(alignment_id))}">'
+        f"{escape(role_name)}</span>",
     )
 
 
+def role(player: core.Player) -> Markup:
+    """Get the role name of a player as HTML."""
+    return role_html(player.alignment.id, player.role_name)
+
+
+def game_view(
+    require: Literal["mod", "mod_or_player"] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Look up the game of a view and check who is making the request.
+
+    Like `mafia.api.v1.auth.game_view`, but with the path parameters and messages of v0.
+    The game is found from the `gid` or `game_id` path parameter, and the player from
+    `name`. Views get whichever of `game`, `player`, `viewer`, `mod_token` and `is_mod`
+    they declare, as well as their path parameters. Views for requests that may modify
+    the game are called with the game's lock held.
+    Responds with 404 if the game or player does not exist, and with 401 or 403 if the
+    request does not meet `require`:
+
+    * `"mod"`: the request is from the moderator.
+    * `"mod_or_player"`: the request is from the moderator or the player in the path.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        params = frozenset(signature(func).parameters)
+
+        @wraps(func)
+        def wrapper(**kwargs: Any) -> Any:
+            game = games.get(kwargs["gid"] if "gid" in kwargs else kwargs["game_id"])
+            if game is None:
+                return {"message": "Game not found"}, 404
+            player = None
+            if "name" in kwargs:
+                player = game.players_by_name.get(kwargs["name"])
+                if player is None:
+                    return {"message": "Player not found"}, 404
+            mod_token, viewer = get_permissions(game, request.headers)
+            is_mod = mod_token == game.mod_token
+            if require is not None and not is_mod:
+                if mod_token is None and viewer is None:
+                    return {"message": "Not authenticated"}, 401
+                if require == "mod" or viewer is None:
+                    return {"message": "Not the moderator"}, 403
+                if viewer is not player:
+                    return {"message": "Not your player"}, 403
+            kwargs.update(
+                game=game,
+                player=player,
+                viewer=viewer,
+                mod_token=mod_token,
+                is_mod=is_mod,
+            )
+            with request_lock(game):
+                return func(**{k: v for k, v in kwargs.items() if k in params})
+
+        return wrapper
+
+    return decorate
+
+
+def player_summary(player: core.Player, *, show_role: bool) -> dict[str, Any]:
+    """Get the name and status of a player, and their role if it is shown."""
+    if not show_role:
+        return {"name": player.name, "is_alive": player.is_alive}
+    return {
+        "name": player.name,
+        "is_alive": player.is_alive,
+        "role_name": player.role_name,
+        "role_name_html": role(player),
+        "role": player.role.id,
+        "alignment": player.alignment.id,
+    }
+
+
+def player_list(
+    game: Game,
+    *,
+    is_mod: bool,
+    viewer: core.Player | None,
+) -> list[dict[str, Any]]:
+    """Get the players of a game, with the roles the viewer may see."""
+    return [
+        player_summary(
+            p,
+            show_role=is_mod
+            or not p.is_alive
+            or (viewer is not None and (p == viewer or p in viewer.known_players)),
+        )
+        for p in game.players
+    ]
+
+
+def chat_list(
+    game: Game,
+    *,
+    is_mod: bool,
+    viewer: core.Player | None,
+) -> list[dict[str, Any]]:
+    """Get the chats of a game that the moderator or viewer may read."""
+    return [
+        {
+            "id": chat_id,
+            "message_count": len(chat),
+        }
+        for chat_id, chat in game.chats.items()
+        if is_mod or chat.has_read_perms(game, viewer)
+    ]
+
+
+def ability_lists(game: Game, player: core.Player) -> dict[str, list[dict[str, Any]]]:
+    """Get the actions, shared actions and passives of a player."""
+    return {
+        "actions": [
+            {
+                "id": a.id,
+                "phase": a.phase.name if a.phase is not None else None,
+                "immediate": a.immediate,
+                "target_count": a.target_count,
+                "targets": valid_target_names(game, player, a),
+                "queued": [t.name for t in v.targets]
+                if (v := game.queued_by_actor_ability.get((player, a))) is not None
+                else None,
+            }
+            for a in player.actions
+        ],
+        "shared_actions": [
+            {
+                "id": a.id,
+                "used_by": v.actor.name
+                if (v := game.queued_by_ability_alignment.get((a, player.alignment)))
+                is not None
+                else None,
+                "phase": a.phase.name if a.phase is not None else None,
+                "immediate": a.immediate,
+                "target_count": a.target_count,
+                "targets": valid_target_names(game, player, a),
+                "queued": [t.name for t in v.targets]
+                if (v := game.queued_by_ability_alignment.get((a, player.alignment)))
+                is not None
+                else None,
+            }
+            for a in player.shared_actions
+        ],
+        "passives": [
+            {
+                "id": a.id,
+                "phase": a.phase.name if a.phase is not None else None,
+                "immediate": a.immediate,
+                "queued": a.check(game, player),
+            }
+            for a in player.passives
+        ],
+    }
+
+
+def int_arg(name: str, default: int) -> int | None:
+    """Get an integer query argument, or None if it is not an integer."""
+    try:
+        return int(request.args.get(name, default))
+    except ValueError:
+        return None
+
+
+def cached_json(game: Game, key: Hashable, build: Callable[[], Any]) -> Response:
+    """Get a JSON response whose body is cached until the game changes.
+
+    The response has an ETag of its body, so polling clients that send it back in
+    `If-None-Match` get an empty 304 response while nothing has changed.
+    """
+
+    def build_data() -> tuple[bytes, str]:
+        data = jsonify(build()).get_data()
+        return data, generate_etag(data)
+
+    data, etag = game.cached(key, build_data)
+    response = Response(data, mimetype="application/json")
+    response.set_etag(etag)
+    response.make_conditional(request)
+    return response
+
+
 # API V0 ENDPOINTS #
 
 api_bp = Blueprint("api_v0", __name__, url_prefix="/api/v0")
@@ -62,7 +258,8 @@ def api_v0_games() -> Any:
                 "phase": game.phase.name,
                 "day_no": game.day_no,
             }
-            for gid, game in games.items()
+            # Copied first, so other threads can't resize `games` while it is iterated.
+            for gid, game in list(games.items())
         ],
     }
 
@@ -196,7 +393,14 @@ def api_v0_create_game() -> Any:
 
 
 @api_bp.get("/games/<int:gid>")
-def api_v0_get_game(gid: int) -> Any:
+@game_view()
+def api_v0_get_game(
+    gid: int,
+    game: Game,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> Any:
     """Get game overview.
 
     Authorization: None (Moderators/Players get extra information)
@@ -219,50 +423,22 @@ def api_v0_get_game(gid: int) -> Any:
     * 200 OK
     * 404 Not Found
     """
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-
-    game = games[gid]
-
-    """Headers:
-    * Authorization-Player-Name
-    * Authorization-Mod-Token
-    """  # Get permissions
-    mod_token, player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-
-    return {
-        "game_id": gid,
-        "day_no": game.day_no,
-        "phase": game.phase.name,
-        "players": [
-            {
-                "name": p.name,
-                "is_alive": p.is_alive,
-                "role_name": p.role_name,
-                "role_name_html": role(p),
-                "role": p.role.id,
-                "alignment": p.alignment.id,
-            }
-            if is_mod
-            or not p.is_alive
-            or (player is not None and (p == player or p in player.known_players))
-            else {"name": p.name, "is_alive": p.is_alive}
-            for p in game.players
-        ],
-        "chats": [
-            {
-                "id": gid,
-                "message_count": len(chat),
-            }
-            for gid, chat in game.chats.items()
-            if chat.has_read_perms(game, player)
-        ],
-    }
+    return cached_json(
+        game,
+        ("v0.game", is_mod, viewer),
+        lambda: {
+            "game_id": gid,
+            "day_no": game.day_no,
+            "phase": game.phase.name,
+            "players": player_list(game, is_mod=is_mod, viewer=viewer),
+            "chats": chat_list(game, is_mod=is_mod, viewer=viewer),
+        },
+    )
 
 
 @api_bp.put("/games/<int:gid>")
-def api_v0_update_game(gid: int) -> Any:
+@game_view(require="mod")
+def api_v0_update_game(game: Game) -> Any:
     """Update game data.
 
     Authorization: Moderator
@@ -279,16 +455,6 @@ def api_v0_update_game(gid: int) -> Any:
     * 404 Not Found
     * 415 Unsupported Media Type
     """
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    if mod_token is None and player is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token:
-        return {"message": "Not the moderator"}, 403
-
     body = request.get_json()
     if body is None:
         return {"message": "Request body is not JSON"}, 415
@@ -317,7 +483,8 @@ def api_v0_update_game(gid: int) -> Any:
 
 
 @api_bp.patch("/games/<int:gid>")
-def api_v0_patch_game(gid: int) -> Any:
+@game_view(require="mod")
+def api_v0_patch_game(game: Game) -> Any:
     """Update game data.
 
     Authorization: Moderator
@@ -328,14 +495,6 @@ def api_v0_patch_game(gid: int) -> Any:
         * `"resolve"` - Resolve the game.
         * `"next_phase"` - Will advance game phase/day.
     """
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    if mod_token is None and player is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token:
-        return {"message": "Not the moderator"}, 403
     body = request.get_json()
     if body is None:
         return {"message": "Request body is not JSON"}, 415
@@ -359,19 +518,22 @@ def api_v0_patch_game(gid: int) -> Any:
 
 
 @api_bp.get("/games/<int:game_id>/players")
-def api_v0_get_players(game_id: int) -> Any:
+@game_view()
+def api_v0_get_players(game: Game, viewer: core.Player | None, *, is_mod: bool) -> Any:
     """Get an array of players.
 
     Returns `"players"` field from using `GET /games/{game_id}`.
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-
-    return api_v0_get_game(game_id)["players"]
+    return cached_json(
+        game,
+        ("v0.players", is_mod, viewer),
+        lambda: player_list(game, is_mod=is_mod, viewer=viewer),
+    )
 
 
 @api_bp.get("/games/<int:game_id>/players/<string:name>")
-def api_v0_get_player(game_id: int, name: str) -> Any:
+@game_view(require="mod_or_player")
+def api_v0_get_player(player: core.Player) -> Any:
     """Get player-specific information.
 
     Authorization: Player (Self), Moderator
@@ -405,22 +567,6 @@ def api_v0_get_player(game_id: int, name: str) -> Any:
     * 403 Forbidden
     * 404 Not Found
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-
-    game = games[game_id]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, auth_player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if mod_token is None and auth_player is None:
-        return {"message": "Not authenticated"}, 401
-    if not is_mod and auth_player is None:
-        return {"message": "Not the moderator"}, 403
-    if not is_mod and auth_player is not player:
-        return {"message": "Not your player"}, 403
-
     return {
         "name": player.name,
         "is_alive": player.is_alive,
@@ -439,15 +585,7 @@ def api_v0_get_player(game_id: int, name: str) -> Any:
             "shared_actions": [a.id for a in player.alignment.shared_actions],
         },
         "known_players": [
-            {
-                "name": p.name,
-                "is_alive": p.is_alive,
-                "role_name": p.role_name,
-                "role_name_html": role(p),
-                "role": p.role.id,
-                "alignment": p.alignment.id,
-            }
-            for p in player.known_players
+            player_summary(p, show_role=True) for p in player.known_players
         ],
         "private_messages": {
             "message_count": len(player.private_messages),
@@ -456,7 +594,8 @@ def api_v0_get_player(game_id: int, name: str) -> Any:
 
 
 @api_bp.get("/games/<int:game_id>/players/<string:name>/abilities")
-def api_v0_get_abilities(game_id: int, name: str) -> Any:
+@game_view(require="mod_or_player")
+def api_v0_get_abilities(game: Game, player: core.Player) -> Any:
     """Get a list of abilities a player has.
 
     Authorization: Player (Self), Moderator
@@ -492,91 +631,16 @@ def api_v0_get_abilities(game_id: int, name: str) -> Any:
     * 403 Forbidden
     * 404 Not Found
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, auth_player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if mod_token is None and auth_player is None:
-        return {"message": "Not authenticated"}, 401
-    if not is_mod and auth_player is None:
-        return {"message": "Not the moderator"}, 403
-    if not is_mod and auth_player is not player:
-        return {"message": "Not your player"}, 403
-    return {
-        "actions": [
-            {
-                "id": a.id,
-                "phase": a.phase.name if a.phase is not None else None,
-                "immediate": a.immediate,
-                "target_count": a.target_count,
-                "targets": [
-                    [t.name for t in targets] for targets in a.valid_targets(game, player)
-                ]
-                if a.target_count > 0
-                else [],
-                "queued": [t.name for t in v]
-                if (
-                    v := next(
-                        (
-                            v.targets
-                            for v in game.queued_visits
-                            if v.actor == player and v.ability == a
-                        ),
-                        None,
-                    )
-                )
-                is not None
-                else None,
-            }
-            for a in player.actions
-        ],
-        "shared_actions": [
-            {
-                "id": a.id,
-                "used_by": visit.actor.name
-                if (
-                    visit := next((v for v in game.queued_visits if v.ability is a), None)
-                )
-                is not None
-                else None,
-                "phase": a.phase.name if a.phase is not None else None,
-                "immediate": a.immediate,
-                "target_count": a.target_count,
-                "targets": [
-                    [t.name for t in targets] for targets in a.valid_targets(game, player)
-                ]
-                if a.target_count > 0
-                else [],
-                "queued": [t.name for t in v]
-                if (
-                    v := next(
-                        (v.targets for v in game.queued_visits if v.ability == a),
-                        None,
-                    )
-                )
-                is not None
-                else None,
-            }
-            for a in player.shared_actions
-        ],
-        "passives": [
-            {
-                "id": a.id,
-                "phase": a.phase.name if a.phase is not None else None,
-                "immediate": a.immediate,
-                "queued": a.check(game, player),
-            }
-            for a in player.passives
-        ],
-    }
+    return cached_json(
+        game,
+        ("v0.abilities", player),
+        lambda: ability_lists(game, player),
+    )
 
 
 @api_bp.post("/games/<int:game_id>/players/<string:name>/abilities")
-def api_v0_queue_ability(game_id: int, name: str) -> Any:
+@game_view(require="mod_or_player")
+def api_v0_queue_ability(game: Game, player: core.Player) -> Any:
     """Queue an action.
 
     Authorization: Player (Self), Moderator
@@ -595,20 +659,6 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
     * 404 Not Found
     * 415 Unsupported Media Type
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, auth_player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if mod_token is None and auth_player is None:
-        return {"message": "Not authenticated"}, 401
-    if not is_mod and auth_player is None:
-        return {"message": "Not the moderator"}, 403
-    if not is_mod and auth_player is not player:
-        return {"message": "Not your player"}, 403
     body = request.get_json()
     if body is None:
         return {"message": "Request body is not JSON"}, 415
@@ -621,25 +671,21 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
     if not isinstance(body["shared_actions"], dict):
         return {"message": "'shared_actions' field is not a JSON object"}, 400
 
+    actions = {a.id: a for a in player.actions}
+    shared_actions = {a.id: a for a in player.shared_actions}
+
     # Check all actions
     for action_id, target_list in body["actions"].items():
-        ability = next((a for a in player.actions if a.id == action_id), None)
+        ability = actions.get(action_id)
         if ability is None:
             return {
                 "message": f"'actions[{action_id!r}]' field contains invalid action id",
             }, 400
         if target_list is None:
             # Remove action from queue
-            prev_visit = next(
-                (
-                    v
-                    for v in game.queued_visits
-                    if v.actor is player and v.ability is ability
-                ),
-                None,
-            )
+            prev_visit = game.queued_by_actor_ability.get((player, ability))
             if prev_visit is not None:
-                game.queued_visits.remove(prev_visit)
+                game.unqueue_visit(prev_visit)
             continue
         if not isinstance(target_list, list):
             return {"message": f"'actions[{action_id!r}]' field is not a list"}, 400
@@ -649,7 +695,7 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
             }, 400
         targets = []
         for target_name in target_list:
-            target = next((p for p in game.players if p.name == target_name), None)
+            target = game.players_by_name.get(target_name)
             if target is None:
                 return {
                     "message": f"'actions[{action_id!r}]' field contains invalid "
@@ -680,13 +726,10 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
                 ),
             )
             continue
-        prev_visit = next(
-            (v for v in game.queued_visits if v.actor is player and v.ability is ability),
-            None,
-        )
+        prev_visit = game.queued_by_actor_ability.get((player, ability))
         if prev_visit is not None:
-            game.queued_visits.remove(prev_visit)
-        game.queued_visits.append(
+            game.unqueue_visit(prev_visit)
+        game.queue_visit(
             core.Visit(
                 actor=player,
                 targets=tuple(targets),
@@ -696,7 +739,7 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
             ),
         )
     for action_id, target_list in body["shared_actions"].items():
-        ability = next((a for a in player.shared_actions if a.id == action_id), None)
+        ability = shared_actions.get(action_id)
         if ability is None:
             return {
                 "message": f"'shared_actions[{action_id!r}]' field contains "
@@ -704,12 +747,9 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
             }, 400
         if target_list is None:
             # Remove action from queue
-            prev_visit = next(
-                (v for v in game.queued_visits if v.ability is ability),
-                None,
-            )
+            prev_visit = game.queued_by_ability_alignment.get((ability, player.alignment))
             if prev_visit is not None:
-                game.queued_visits.remove(prev_visit)
+                game.unqueue_visit(prev_visit)
             continue
         if not isinstance(target_list, list):
             return {
@@ -722,7 +762,7 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
             }, 400
         targets = []
         for target_name in target_list:
-            target = next((p for p in game.players if p.name == target_name), None)
+            target = game.players_by_name.get(target_name)
             if target is None:
                 return {
                     "message": f"'shared_actions[{action_id!r}]' field contains "
@@ -753,13 +793,10 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
                 ),
             )
             continue
-        prev_visit = next(
-            (v for v in game.queued_visits if v.ability is ability),
-            None,
-        )
+        prev_visit = game.queued_by_ability_alignment.get((ability, player.alignment))
         if prev_visit is not None:
-            game.queued_visits.remove(prev_visit)
-        game.queued_visits.append(
+            game.unqueue_visit(prev_visit)
+        game.queue_visit(
             core.Visit(
                 actor=player,
                 targets=tuple(targets),
@@ -772,14 +809,15 @@ def api_v0_queue_ability(game_id: int, name: str) -> Any:
 
 
 @api_bp.get("/games/<int:game_id>/players/<string:name>/messages")
-def api_v0_get_messages(game_id: int, name: str) -> Any:
+@game_view(require="mod_or_player")
+def api_v0_get_messages(player: core.Player) -> Any:
     """Get a player's private messages (zero-indexed).
 
     Authorization: Player (Self), Moderator
 
     URL Parameters:
     * `start`: `int` (default: `0`)
-    * `limit`: `int` (default: `25`)
+    * `limit`: `int` (default: `25`, at most `200`)
 
     Response Body:
     * `total_messages`: `int`
@@ -795,26 +833,14 @@ def api_v0_get_messages(game_id: int, name: str) -> Any:
     * 404 Not Found &mdash; unlike with private chats, all players have private messages,
     even if they don't use it, so we do not return 404 if unauthorized.
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, auth_player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if mod_token is None and auth_player is None:
-        return {"message": "Not authenticated"}, 401
-    if not is_mod and auth_player is None:
-        return {"message": "Not the moderator"}, 403
-    if not is_mod and auth_player is not player:
-        return {"message": "Not your player"}, 403
-    start = request.args.get("start", 0, type=int)
-    limit = request.args.get("limit", 25, type=int)
-    if not isinstance(start, int):
+    start = int_arg("start", 0)
+    limit = int_arg("limit", 25)
+    if start is None:
         return {"message": "'start' field is not an integer"}, 400
-    if not isinstance(limit, int):
+    if limit is None:
         return {"message": "'limit' field is not an integer"}, 400
+    start = max(start, 0)
+    limit = min(25 if limit < 0 else limit, MAX_MESSAGE_LIMIT)
     return {
         "total_messages": len(player.private_messages),
         "messages": [
@@ -823,13 +849,17 @@ def api_v0_get_messages(game_id: int, name: str) -> Any:
                 "timestamp": idx,
                 "content": msg.content,
             }
-            for idx, msg in enumerate(player.private_messages[start : start + limit])
+            for idx, msg in enumerate(
+                player.private_messages[start : start + limit],
+                start=start,
+            )
         ],
     }
 
 
 @api_bp.post("/games/<int:game_id>/players/<string:name>/messages")
-def api_v0_send_message(game_id: int, name: str) -> Any:
+@game_view(require="mod_or_player")
+def api_v0_send_message(player: core.Player, viewer: core.Player | None) -> Any:
     """Send a private message to a player.
 
     Authorization: Player (Self), Moderator
@@ -845,20 +875,6 @@ def api_v0_send_message(game_id: int, name: str) -> Any:
     * 404 Not Found
     * 415 Unsupported Media Type
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, auth_player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if mod_token is None and auth_player is None:
-        return {"message": "Not authenticated"}, 401
-    if not is_mod and auth_player is None:
-        return {"message": "Not the moderator"}, 403
-    if not is_mod and auth_player is not player:
-        return {"message": "Not your player"}, 403
     body = request.get_json()
     if body is None:
         return {"message": "Request body is not JSON"}, 415
@@ -869,7 +885,7 @@ def api_v0_send_message(game_id: int, name: str) -> Any:
     if not isinstance(body["content"], str):
         return {"message": "'content' field is not a string"}, 400
     player.private_messages.send(
-        auth_player.name if auth_player is not None else "Moderator",
+        viewer.name if viewer is not None else "Moderator",
         body["content"],
         type=ChatMessage,
     )
@@ -877,18 +893,28 @@ def api_v0_send_message(game_id: int, name: str) -> Any:
 
 
 @api_bp.get("/games/<int:game_id>/chats")
-def api_v0_get_chats(game_id: int) -> Any:
+@game_view()
+def api_v0_get_chats(game: Game, viewer: core.Player | None, *, is_mod: bool) -> Any:
     """Get an array of chats.
 
     Returns `"chats"` field from using `GET /games/{game_id}`.
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    return api_v0_get_game(game_id)["chats"]
+    return cached_json(
+        game,
+        ("v0.chats", is_mod, viewer),
+        lambda: chat_list(game, is_mod=is_mod, viewer=viewer),
+    )
 
 
 @api_bp.get("/games/<int:game_id>/chats/<string:chat_id>")
-def api_v0_get_chat(game_id: int, chat_id: str) -> Any:
+@game_view()
+def api_v0_get_chat(
+    game: Game,
+    chat_id: str,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> Any:
     """Get a chat's data.
 
     Authorization: None (Public Chats), Player (Read Perms), Moderator
@@ -904,33 +930,40 @@ def api_v0_get_chat(game_id: int, chat_id: str) -> Any:
     * 404 Not Found &mdash; Returned in place of 401 or 403
       for those without read permissions.
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
     chat = game.chats.get(chat_id)
     if chat is None:
         return {"message": "Chat not found"}, 404
-    mod_token, player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if not is_mod and not chat.has_read_perms(game, player):
+    if not is_mod and not chat.has_read_perms(game, viewer):
         return {"message": "Chat not found"}, 404
-    return {
-        "chat_id": chat_id,
-        "read_perms": [p.name for p in chat.read_perms(game)],
-        "write_perms": [p.name for p in chat.write_perms(game)],
-        "total_messages": len(chat),
-    }
+    # The same for every reader, so it is cached once per chat.
+    return cached_json(
+        game,
+        ("v0.chat", chat_id),
+        lambda: {
+            "chat_id": chat_id,
+            "read_perms": [p.name for p in chat.read_perms(game)],
+            "write_perms": [p.name for p in chat.write_perms(game)],
+            "total_messages": len(chat),
+        },
+    )
 
 
 @api_bp.get("/games/<int:game_id>/chats/<string:chat_id>/messages")
-def api_v0_get_chat_messages(game_id: int, chat_id: str) -> Any:
+@game_view()
+def api_v0_get_chat_messages(
+    game: Game,
+    chat_id: str,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> Any:
     """Get chat messages (zero-indexed).
 
     Authorization: None (Public Chats), Player (Read Perms), Moderator
 
     URL Parameters:
     * `start`: `int` (default: `0`)
-    * `limit`: `int` (default: `25`)
+    * `limit`: `int` (default: `25`, at most `200`)
 
     Response Body:
     * `chat_id`: `string`
@@ -945,35 +978,39 @@ def api_v0_get_chat_messages(game_id: int, chat_id: str) -> Any:
     * 404 Not Found &mdash; Returned in place of 401 or 403
       for those without read permissions.
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
     chat = game.chats.get(chat_id)
     if chat is None:
         return {"message": "Chat not found"}, 404
-    mod_token, player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if not is_mod and not chat.has_read_perms(game, player):
+    if not is_mod and not chat.has_read_perms(game, viewer):
         return {"message": "Chat not found"}, 404
-    start = request.args.get("start", 0)
-    limit = request.args.get("limit", 25)
-    if not isinstance(start, int):
+    start = int_arg("start", 0)
+    limit = int_arg("limit", 25)
+    if start is None:
         return {"message": "'start' field is not an integer"}, 400
-    if not isinstance(limit, int):
+    if limit is None:
         return {"message": "'limit' field is not an integer"}, 400
+    start = max(start, 0)
+    limit = min(25 if limit < 0 else limit, MAX_MESSAGE_LIMIT)
     return {
         "chat_id": chat_id,
         "total_messages": len(chat),
         "messages": [
             {"author": msg.sender, "timestamp": idx, "content": msg.content}
-            for idx, msg in enumerate(chat[start : start + limit])
+            for idx, msg in enumerate(chat[start : start + limit], start=start)
         ],
     }
 
 
 @api_bp.post("/games/<int:game_id>/chats/<string:chat_id>")
 @api_bp.post("/games/<int:game_id>/chats/<string:chat_id>/messages")
-def api_v0_send_chat_message(game_id: int, chat_id: str) -> Any:
+@game_view()
+def api_v0_send_chat_message(
+    game: Game,
+    chat_id: str,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> Any:
     """Send a chat message. Message is attributed to the authorized sender.
 
     Authorization: Player (Write Perms), Moderator
@@ -990,15 +1027,10 @@ def api_v0_send_chat_message(game_id: int, chat_id: str) -> Any:
       for those without read permissions.
     * 415 Unsupported Media Type
     """
-    if game_id not in games:
-        return {"message": "Game not found"}, 404
-    game = games[game_id]
     chat = game.chats.get(chat_id)
     if chat is None:
         return {"message": "Chat not found"}, 404
-    mod_token, player = get_permissions(game, request.headers)
-    is_mod = mod_token == game.mod_token
-    if not is_mod and not chat.has_write_perms(game, player):
+    if not is_mod and not chat.has_write_perms(game, viewer):
         return {"message": "Chat not found"}, 404
     body = request.get_json()
     if body is None:
@@ -1010,7 +1042,7 @@ def api_v0_send_chat_message(game_id: int, chat_id: str) -> Any:
     if not isinstance(body["content"], str):
         return {"message": "'content' field is not a string"}, 400
     chat.send(
-        player.name if player is not None else "Moderator",
+        viewer.name if viewer is not None else "Moderator",
         body["content"],
         type=ChatMessage,
     )
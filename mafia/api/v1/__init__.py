@@ -2,28 +2,61 @@
 
 import random
 from collections.abc import Callable
+from itertools import islice
 
-from flask import Blueprint, request
-from flask_pydantic import validate  # type: ignore[import-untyped]
+from flask import Blueprint, Response
 
 from mafia import core, normal
-from mafia.api.core import ChatMessage, Game, game_count, games, get_permissions, resolver
+from mafia.api.core import (
+    MAX_MESSAGE_LIMIT,
+    ChatMessage,
+    Game,
+    game_count,
+    games,
+    resolver,
+    valid_target_names,
+)
 
 from . import models
+from .auth import game_view
+from .validation import validate
 
 api_bp = Blueprint("api_v1", __name__, url_prefix="/api/v1")
 
 
+def short_player_model(
+    player: core.Player,
+    *,
+    show_role: bool,
+) -> models.ShortPlayerModel | models.ShortPartialPlayerModel:
+    """Get the summary of a player, including their role if it is visible."""
+    if not show_role:
+        return models.ShortPartialPlayerModel.model_construct(
+            name=player.name,
+            is_alive=player.is_alive,
+        )
+    return models.ShortPlayerModel.model_construct(
+        name=player.name,
+        is_alive=player.is_alive,
+        role_name=player.role_name,
+        role=player.role.id,
+        alignment=player.alignment.id,
+    )
+
+
 @api_bp.get("/games")
-@validate()  # type: ignore[misc]
+@validate()
 def game_list(query: models.GameListQueryModel) -> models.GameListResponseModel:
     """Get the list of games."""
     start = max(query.start, 0)
     limit = 25 if query.limit < 0 else query.limit
-    game_result = sorted(games.items(), key=lambda x: x[0])[start : start + limit]
-    return models.GameListResponseModel(
+    # Ids are allocated in increasing order, so `games` is already sorted by id.
+    # The page is copied in one C-level call, so other threads can't resize `games`
+    # while it is iterated.
+    game_result = list(islice(games.items(), start, start + limit))
+    return models.GameListResponseModel.model_construct(
         games=[
-            models.GameSummaryModel(
+            models.GameSummaryModel.model_construct(
                 id=gid,
                 players=[player.name for player in game.players],
                 phase=game.phase,
@@ -38,28 +71,40 @@ def game_list(query: models.GameListQueryModel) -> models.GameListResponseModel:
 
 
 @api_bp.post("/games")
-@validate()  # type: ignore[misc]
+@validate()
 def game_create(
     body: models.GameCreateRequestModel,
 ) -> tuple[models.GameCreateResponseModel, int]:
     """Create a new game."""
-    roles = list(body.roles)
+    # The body is validated per request, so its role list can be shuffled in place.
+    roles = body.roles
 
     if body.shuffle_roles:
-        random.shuffle(roles)
+        random.Random(body.seed).shuffle(roles)  # noqa: S311  # not for security
 
+    # Resolve each role's factories once; nested role trees are rebuilt on every call.
+    # Players with the same alignment type and id share one alignment instance.
     alignments: dict[
         tuple[type[core.Alignment] | Callable[..., core.Alignment], str | None],
         core.Alignment,
     ] = {}
+    resolved: list[
+        tuple[
+            models.GameCreateRequestRole,
+            type[core.Role] | Callable[..., core.Role],
+            core.Alignment,
+        ]
+    ] = []
     for r in roles:
         a = r.alignment_value()
-        if (a, r.alignment_id) not in alignments:
-            alignments[a, r.alignment_id] = a(
+        alignment = alignments.get((a, r.alignment_id))
+        if alignment is None:
+            alignment = alignments[a, r.alignment_id] = a(
                 id=r.alignment_id,
                 demonym=r.alignment_demonym,
                 role_names=r.alignment_role_names,
             )
+        resolved.append((r, r.role.value(), alignment))
 
     if body.phase is None:
         body.phase = body.phase_order[0]
@@ -71,96 +116,115 @@ def game_create(
         chat_phases=frozenset(body.chat_phases),
     )
 
-    for player_name, role in zip(body.players, roles, strict=False):
-        game.add_player(
-            core.Player(
-                player_name,
-                role.role.value()(**role.role_params),
-                alignments[role.alignment_value(), role.alignment_id],
-            ),
-        )
+    for player_name, (r, role_type, alignment) in zip(
+        body.players,
+        resolved,
+        strict=False,
+    ):
+        game.add_player(core.Player(player_name, role_type(**r.role_params), alignment))
 
     gid = next(game_count)
 
     games[gid] = game
 
-    return models.GameCreateResponseModel(id=gid, mod_token=game.mod_token), 201
+    return models.GameCreateResponseModel.model_construct(
+        id=gid,
+        mod_token=game.mod_token,
+    ), 201
 
 
-@api_bp.get("/games/<int:gid>")
-@validate()  # type: ignore[misc]
-def game_get(gid: int) -> models.GameResponseModel | models.ErrorResponse:
-    """Get a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    return models.GameResponseModel(
+def player_list(
+    game: Game,
+    *,
+    is_mod: bool,
+    player: core.Player | None,
+) -> list[models.ShortPlayerModel | models.ShortPartialPlayerModel]:
+    """Get the summaries of the players in a game, as seen by the mod or a player."""
+    if is_mod:
+        return [short_player_model(p, show_role=True) for p in game.players]
+    known_players = player.known_players if player is not None else set()
+    return [
+        short_player_model(
+            p,
+            show_role=player is p or not p.is_alive or p in known_players,
+        )
+        for p in game.players
+    ]
+
+
+def chat_list(
+    game: Game,
+    *,
+    is_mod: bool,
+    player: core.Player | None,
+) -> list[models.ShortChatModel]:
+    """Get the summaries of the chats in a game that the mod or a player can read."""
+    return [
+        models.ShortChatModel.model_construct(
+            id=chat_id,
+            total_messages=len(chat),
+        )
+        for chat_id, chat in game.chats.items()
+        if is_mod or chat.has_read_perms(game, player)
+    ]
+
+
+def game_response(
+    gid: int,
+    game: Game,
+    *,
+    is_mod: bool,
+    player: core.Player | None,
+) -> models.GameResponseModel:
+    """Get a game as seen by the moderator or a player (or anyone if neither)."""
+    return models.GameResponseModel.model_construct(
         id=gid,
         day_no=game.day_no,
         phase=game.phase,
-        players=[
-            models.ShortPlayerModel(
-                name=p.name,
-                is_alive=p.is_alive,
-                role_name=p.role_name,
-                role=p.role.id,
-                alignment=p.alignment.id,
-            )
-            if mod_token == game.mod_token
-            or player is p
-            or not p.is_alive
-            or (player is not None and p in player.known_players)
-            else models.ShortPartialPlayerModel(
-                name=p.name,
-                is_alive=p.is_alive,
-            )
-            for p in game.players
-        ],
-        chats=[
-            models.ShortChatModel(
-                id=chat_id,
-                total_messages=len(chat),
-            )
-            for chat_id, chat in game.chats.items()
-            if mod_token == game.mod_token or chat.has_read_perms(game, player)
-        ],
+        players=player_list(game, is_mod=is_mod, player=player),
+        chats=chat_list(game, is_mod=is_mod, player=player),
         phase_order=list(game.phase_order),
         chat_phases=list(game.chat_phases),
     )
 
 
+@api_bp.get("/games/<int:gid>")
+@validate()
+@game_view()
+def game_get(
+    gid: int,
+    game: Game,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> Response | models.ErrorResponse:
+    """Get a game."""
+    # Each viewer sees the same view until the game is modified, so it is cached per
+    # viewer. There is at most one entry per player, plus the moderator and everyone else.
+    data = game.cached(
+        ("v1.game_get", is_mod, viewer),
+        lambda: game_response(gid, game, is_mod=is_mod, player=viewer).model_dump_json(),
+    )
+    return Response(data, mimetype="application/json")
+
+
 @api_bp.delete("/games/<int:gid>")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod")
 def game_delete(gid: int) -> models.EmptyResponse | models.ErrorResponse:
     """Delete a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    if mod_token is None and player is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token:
-        return {"message": "Not the moderator"}, 403
     del games[gid]
     return "", 204
 
 
 @api_bp.put("/games/<int:gid>")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod")
 def game_put(
-    gid: int,
+    game: Game,
     body: models.GamePutRequestModel,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Update a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    if mod_token is None and player is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token:
-        return {"message": "Not the moderator"}, 403
     if body.day_no is not None:
         game.day_no = body.day_no
     if body.phase is not None:
@@ -176,15 +240,9 @@ def handle_patch_action(game: Game, action: models.GamePatchAction) -> None:
     """Handle a patch action."""
     match action:
         case models.GamePatchAction.DEQUEUE:
-            for v in game.queued_visits:
-                if v.is_active_time(game) and v.ability.check(game, v.actor, v.targets):
-                    game.visits.append(v)
-            game.queued_visits.clear()
+            game.dequeue_visits()
         case models.GamePatchAction.RESOLVE:
-            for v in game.queued_visits:
-                if v.is_active_time(game) and v.ability.check(game, v.actor, v.targets):
-                    game.visits.append(v)
-            game.queued_visits.clear()
+            game.dequeue_visits()
             resolver.resolve_game(game)
         case models.GamePatchAction.NEXT_PHASE | models.GamePatchAction.ADVANCE_PHASE:
             game.advance_phase()
@@ -195,108 +253,72 @@ def handle_patch_action(game: Game, action: models.GamePatchAction) -> None:
 
 
 @api_bp.patch("/games/<int:gid>")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod")
 def game_patch(
-    gid: int,
+    game: Game,
     body: models.GamePatchRequestModel,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Update a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    if mod_token is None and player is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token:
-        return {"message": "Not the moderator"}, 403
     for action in body.actions:
         handle_patch_action(game, action)
     return "", 204
 
 
 @api_bp.get("/games/<int:gid>/players")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view()
 def game_players(
-    gid: int,
+    game: Game,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
 ) -> (
     list[models.ShortPlayerModel | models.ShortPartialPlayerModel] | models.ErrorResponse
 ):
     """Get the players in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    return [
-        models.ShortPlayerModel(
-            name=p.name,
-            is_alive=p.is_alive,
-            role_name=p.role_name,
-            role=p.role.id,
-            alignment=p.alignment.id,
-        )
-        if mod_token == game.mod_token
-        or player is p
-        or not p.is_alive
-        or (player is not None and p in player.known_players)
-        else models.ShortPartialPlayerModel(
-            name=p.name,
-            is_alive=p.is_alive,
-        )
-        for p in game.players
-    ]
+    return player_list(game, is_mod=is_mod, player=viewer)
 
 
 @api_bp.get("/games/<int:gid>/chats")
-@validate()  # type: ignore[misc]
-def game_chats(gid: int) -> list[models.ShortChatModel] | models.ErrorResponse:
+@validate()
+@game_view()
+def game_chats(
+    game: Game,
+    viewer: core.Player | None,
+    *,
+    is_mod: bool,
+) -> list[models.ShortChatModel] | models.ErrorResponse:
     """Get the chats in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
-    return [
-        models.ShortChatModel(
-            id=chat_id,
-            total_messages=len(chat),
-        )
-        for chat_id, chat in game.chats.items()
-        if mod_token == game.mod_token or chat.has_read_perms(game, player)
-    ]
+    return chat_list(game, is_mod=is_mod, player=viewer)
 
 
 @api_bp.get("/games/<int:gid>/players/<string:name>")
-@validate()  # type: ignore[misc]
-def game_player(gid: int, name: str) -> models.PlayerResponseModel | models.ErrorResponse:
+@validate()
+@game_view(require="mod_or_player")
+def game_player(
+    game: Game,
+    player: core.Player,
+) -> models.PlayerResponseModel | models.ErrorResponse:
     """Get a player in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player_auth is not player:
-        return {"message": "Not the moderator or the player"}, 403
-    return models.PlayerResponseModel(
+    return models.PlayerResponseModel.model_construct(
         name=player.name,
         is_alive=player.is_alive,
         role_name=player.role_name,
-        role=models.PlayerRAModel(
+        role=models.PlayerRAModel.model_construct(
             id=player.role.id,
             actions=[a.id for a in player.actions],
             passives=[a.id for a in player.passives],
             shared_actions=[a.id for a in player.shared_actions],
         ),
-        alignment=models.PlayerRAModel(
+        alignment=models.PlayerRAModel.model_construct(
             id=player.alignment.id,
             actions=[a.id for a in player.alignment.actions],
             passives=[a.id for a in player.alignment.passives],
             shared_actions=[a.id for a in player.alignment.shared_actions],
         ),
         known_players=[
-            models.ShortPlayerModel(
+            models.ShortPlayerModel.model_construct(
                 name=p.name,
                 is_alive=p.is_alive,
                 role_name=p.role_name,
@@ -306,65 +328,34 @@ def game_player(gid: int, name: str) -> models.PlayerResponseModel | models.Erro
             for p in player.known_players
         ],
         total_private_messages=len(player.private_messages),
-        chats=[
-            models.ShortChatModel(
-                id=chat_id,
-                total_messages=len(chat),
-            )
-            for chat_id, chat in game.chats.items()
-            if chat.has_read_perms(game, player)
-        ],
+        chats=chat_list(game, is_mod=False, player=player),
     )
 
 
 @api_bp.get("/games/<int:gid>/players/<string:name>/abilities")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod_or_player")
 def game_player_abilities(
-    gid: int,
-    name: str,
+    game: Game,
+    player: core.Player,
 ) -> models.PlayerAbiltiesResponseModel | models.ErrorResponse:
     """Get the abilities of a player in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player_auth is not player:
-        return {"message": "Not the moderator or the player"}, 403
-    return models.PlayerAbiltiesResponseModel(
+    return models.PlayerAbiltiesResponseModel.model_construct(
         actions=[
-            models.PlayerAbilitiesActionModel(
+            models.PlayerAbilitiesActionModel.model_construct(
                 id=a.id,
                 phase=a.phase,
                 immediate=a.immediate,
                 target_count=a.target_count,
-                targets=[
-                    [t.name for t in targets] for targets in a.valid_targets(game, player)
-                ]
-                if a.target_count > 0
-                else [],
+                targets=valid_target_names(game, player, a),
                 queued=[t.name for t in v.targets]
-                if (
-                    v := next(
-                        (
-                            v
-                            for v in game.queued_visits
-                            if v.actor == player and v.ability == a
-                        ),
-                        None,
-                    )
-                )
-                is not None
+                if (v := game.queued_by_actor_ability.get((player, a))) is not None
                 else None,
             )
             for a in player.actions
         ],
         passives=[
-            models.PlayerAbilitiesPassiveModel(
+            models.PlayerAbilitiesPassiveModel.model_construct(
                 id=a.id,
                 phase=a.phase,
                 immediate=a.immediate,
@@ -373,40 +364,18 @@ def game_player_abilities(
             for a in player.passives
         ],
         shared_actions=[
-            models.PlayerAbilitiesSharedActionModel(
+            models.PlayerAbilitiesSharedActionModel.model_construct(
                 id=a.id,
                 used_by=v.actor.name
-                if (
-                    v := next(
-                        (
-                            v
-                            for v in game.queued_visits
-                            if v.ability == a and v.actor.alignment == player.alignment
-                        ),
-                        None,
-                    )
-                )
+                if (v := game.queued_by_ability_alignment.get((a, player.alignment)))
                 is not None
                 else None,
                 phase=a.phase,
                 immediate=a.immediate,
                 target_count=a.target_count,
-                targets=[
-                    [t.name for t in targets] for targets in a.valid_targets(game, player)
-                ]
-                if a.target_count > 0
-                else [],
+                targets=valid_target_names(game, player, a),
                 queued=[t.name for t in v.targets]
-                if (
-                    v := next(
-                        (
-                            v
-                            for v in game.queued_visits
-                            if v.ability == a and v.actor.alignment == player.alignment
-                        ),
-                        None,
-                    )
-                )
+                if (v := game.queued_by_ability_alignment.get((a, player.alignment)))
                 is not None
                 else None,
             )
@@ -422,28 +391,34 @@ def validate_action(  # noqa: PLR0913
     requested_visit: models.PlayerQueueAbilityModel | None,
     valid_actions: dict[str, core.Ability],
     valid_players: dict[str, core.Player],
+    resolved_targets: dict[core.Ability, tuple[core.Player, ...]],
 ) -> models.ErrorResponse | None:
-    """Validate an action for a player in a game."""
+    """Validate an action for a player in a game.
+
+    The targets of a valid visit are stored in `resolved_targets`, keyed by ability.
+    """
     if ability_id not in valid_actions:
         return {
             "message": f"Invalid action '{ability_id}' for player '{player.name}'",
         }, 400
     if requested_visit is not None:
-        invalid_targets = {t for t in requested_visit.targets if t not in valid_players}
-        if invalid_targets:
+        if not all(t in valid_players for t in requested_visit.targets):
+            # Only collect the invalid targets when reporting them, in request order.
+            invalid_targets = dict.fromkeys(
+                t for t in requested_visit.targets if t not in valid_players
+            )
             return {
                 "message": f"Invalid targets for '{ability_id}': "
                 f"{', '.join(invalid_targets)}",
             }, 400
-        if not valid_actions[ability_id].check(
-            game,
-            player,
-            [valid_players[t] for t in requested_visit.targets],
-        ):
+        ability = valid_actions[ability_id]
+        targets = tuple(valid_players[t] for t in requested_visit.targets)
+        if not ability.check(game, player, targets):
             return {
                 "message": f"Check failed for '{ability_id}': "
                 f"{', '.join(requested_visit.targets)}",
             }, 400
+        resolved_targets[ability] = targets
     return None
 
 
@@ -453,24 +428,17 @@ def queue_visit(  # noqa: PLR0913
     ability: core.Ability,
     ability_type: core.AbilityType,
     requested_visit: models.PlayerQueueAbilityModel | None,
-    valid_players: dict[str, core.Player],
+    resolved_targets: dict[core.Ability, tuple[core.Player, ...]],
 ) -> None:
-    """Queue a visit for a player in a game."""
-    prev_visit = next(
-        (
-            v
-            for v in game.queued_visits
-            if v.ability == ability and v.actor.alignment == player.alignment
-        ),
-        None,
-    )
+    """Queue a visit for a player in a game, with the targets found by validate_action."""
+    prev_visit = game.queued_by_ability_alignment.get((ability, player.alignment))
     if prev_visit is not None:
-        game.queued_visits.remove(prev_visit)
+        game.unqueue_visit(prev_visit)
     if requested_visit is not None:
-        game.queued_visits.append(
+        game.queue_visit(
             core.Visit(
                 actor=player,
-                targets=tuple(valid_players[t] for t in requested_visit.targets),
+                targets=resolved_targets[ability],
                 ability=ability,
                 ability_type=ability_type,
                 game=game,
@@ -479,161 +447,130 @@ def queue_visit(  # noqa: PLR0913
         )
 
 
-def validate_ability_requests(  # noqa: PLR0913
+AbilityRequests = tuple[
+    dict[str, models.PlayerQueueAbilityModel | None],
+    dict[str, core.Ability],
+    core.AbilityType,
+]
+
+
+def validate_ability_requests(
     game: Game,
     player: core.Player,
-    body: models.PlayerQueueAbilityRequestModel,
-    valid_actions: dict[str, core.Ability],
-    valid_shared_actions: dict[str, core.Ability],
+    requests: tuple[AbilityRequests, ...],
     valid_players: dict[str, core.Player],
+    resolved_targets: dict[core.Ability, tuple[core.Player, ...]],
 ) -> models.ErrorResponse | None:
     """Validate ability requests for a player in a game."""
-    for ability_id, requested_visit in body.actions.items():
-        message = validate_action(
-            game,
-            player,
-            ability_id,
-            requested_visit,
-            valid_actions,
-            valid_players,
-        )
-        if message is not None:
-            return message
-
-    for ability_id, requested_visit in body.shared_actions.items():
-        message = validate_action(
-            game,
-            player,
-            ability_id,
-            requested_visit,
-            valid_shared_actions,
-            valid_players,
-        )
-        if message is not None:
-            return message
-
+    for requested_visits, valid_actions, _ in requests:
+        for ability_id, requested_visit in requested_visits.items():
+            message = validate_action(
+                game,
+                player,
+                ability_id,
+                requested_visit,
+                valid_actions,
+                valid_players,
+                resolved_targets,
+            )
+            if message is not None:
+                return message
     return None
 
 
 @api_bp.post("/games/<int:gid>/players/<string:name>/abilities")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod_or_player")
 def game_player_queue_ability(
-    gid: int,
-    name: str,
+    game: Game,
+    player: core.Player,
     body: models.PlayerQueueAbilityRequestModel,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Queue an ability for a player in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player_auth is not player:
-        return {"message": "Not the moderator or the player"}, 403
-
-    valid_players = {p.name: p for p in game.players}
-    valid_actions = {a.id: a for a in player.actions}
-    valid_shared_actions = {a.id: a for a in player.shared_actions}
+    # Actions and shared actions are validated and queued the same way.
+    requests: tuple[AbilityRequests, ...] = (
+        (
+            body.actions,
+            {a.id: a for a in player.actions},
+            core.AbilityType.ACTION,
+        ),
+        (
+            body.shared_actions,
+            {a.id: a for a in player.shared_actions},
+            core.AbilityType.SHARED_ACTION,
+        ),
+    )
+    resolved_targets: dict[core.Ability, tuple[core.Player, ...]] = {}
 
     message = validate_ability_requests(
         game,
         player,
-        body,
-        valid_actions,
-        valid_shared_actions,
-        valid_players,
+        requests,
+        game.players_by_name,
+        resolved_targets,
     )
     if message is not None:
         return message
 
-    for ability_id, requested_visit in body.actions.items():
-        queue_visit(
-            game,
-            player,
-            valid_actions[ability_id],
-            core.AbilityType.ACTION,
-            requested_visit,
-            valid_players,
-        )
-
-    for ability_id, requested_visit in body.shared_actions.items():
-        queue_visit(
-            game,
-            player,
-            valid_shared_actions[ability_id],
-            core.AbilityType.SHARED_ACTION,
-            requested_visit,
-            valid_players,
-        )
+    for requested_visits, valid_actions, ability_type in requests:
+        for ability_id, requested_visit in requested_visits.items():
+            queue_visit(
+                game,
+                player,
+                valid_actions[ability_id],
+                ability_type,
+                requested_visit,
+                resolved_targets,
+            )
 
     return "", 204
 
 
 @api_bp.get("/games/<int:gid>/players/<string:name>/messages")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="authenticated")
 def game_player_messages(
-    gid: int,
-    name: str,
+    game: Game,
+    player: core.Player,
+    viewer: core.Player | None,
     query: models.ChatQueryModel,
+    *,
+    is_mod: bool,
 ) -> models.PlayerPMResponseModel | models.ErrorResponse:
     """Get a player's private messages."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and not player.private_messages.has_read_perms(
-        game,
-        player_auth,
-    ):
+    if not is_mod and not player.private_messages.has_read_perms(game, viewer):
         return {"message": "Not the moderator or authorized player"}, 403
     start = max(query.start, 0)
-    limit = 25 if query.limit < 0 else query.limit
-    return models.PlayerPMResponseModel(
+    limit = min(25 if query.limit < 0 else query.limit, MAX_MESSAGE_LIMIT)
+    return models.PlayerPMResponseModel.model_construct(
         total_messages=len(player.private_messages),
         messages=[
-            models.ChatMessageModel(
+            models.ChatMessageModel.model_construct(
                 author=str(msg.sender),
                 timestamp=getattr(msg, "timestamp", None),
                 content=msg.content,
             )
-            for idx, msg in enumerate(player.private_messages[start : start + limit])
+            for msg in player.private_messages[start : start + limit]
         ],
     )
 
 
 @api_bp.post("/games/<int:gid>/players/<string:name>/messages")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="authenticated")
 def game_player_send_message(
-    gid: int,
-    name: str,
+    game: Game,
+    player: core.Player,
+    viewer: core.Player | None,
     body: models.ChatPostRequestModel,
+    *,
+    is_mod: bool,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Send a private message to a player."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player.private_messages.has_write_perms(
-        game,
-        player_auth,
-    ):
+    if not is_mod and player.private_messages.has_write_perms(game, viewer):
         return {"message": "Not the moderator or authorized player"}, 403
     player.private_messages.send(
-        player_auth.name if player_auth is not None else "Moderator",
+        viewer.name if viewer is not None else "Moderator",
         body.content,
         type=ChatMessage,
     )
@@ -641,90 +578,101 @@ def game_player_send_message(
 
 
 @api_bp.get("/games/<int:gid>/chats/<string:chat_id>")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view()
 def game_chat(
-    gid: int,
+    game: Game,
     chat_id: str,
+    viewer: core.Player | None,
+    mod_token: str | None,
+    *,
+    is_mod: bool,
 ) -> models.ChatGetResponseModel | models.ErrorResponse:
     """Get a chat in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
     chat = game.chats.get(chat_id)
-    read_perms = False if chat is None else chat.has_read_perms(game, player)
-    if mod_token is None and player is None and not read_perms:
+    read_perms = False if chat is None else chat.has_read_perms(game, viewer)
+    if mod_token is None and viewer is None and not read_perms:
         return {"message": "Not authenticated"}, 401
-    if chat is None or (mod_token != game.mod_token and not read_perms):
+    if chat is None or (not is_mod and not read_perms):
         return {"message": "Chat not found"}, 404
-    return models.ChatGetResponseModel(
+    # Permissions depend on the players' state, so they are kept until the game changes.
+    read_names, write_names = game.cached(
+        ("v1.chat_perms", chat_id),
+        lambda: (
+            tuple(p.name for p in chat.read_perms(game)),
+            tuple(p.name for p in chat.write_perms(game)),
+        ),
+    )
+    return models.ChatGetResponseModel.model_construct(
         chat_id=chat_id,
-        read_perms=[p.name for p in chat.read_perms(game)],
-        write_perms=[p.name for p in chat.write_perms(game)],
+        read_perms=list(read_names),
+        write_perms=list(write_names),
         total_messages=len(chat),
     )
 
 
 @api_bp.get("/games/<int:gid>/chats/<string:chat_id>/messages")
-@validate()  # type: ignore[misc]
-def game_chat_messages(
-    gid: int,
+@validate()
+@game_view()
+def game_chat_messages(  # noqa: PLR0913
+    game: Game,
     chat_id: str,
+    viewer: core.Player | None,
+    mod_token: str | None,
     query: models.ChatQueryModel,
+    *,
+    is_mod: bool,
 ) -> models.ChatMessagesResponseModel | models.ErrorResponse:
     """Get the messages in a chat."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
     chat = game.chats.get(chat_id)
-    read_perms = False if chat is None else chat.has_read_perms(game, player)
-    if mod_token is None and player is None and not read_perms:
+    read_perms = False if chat is None else chat.has_read_perms(game, viewer)
+    if mod_token is None and viewer is None and not read_perms:
         return {"message": "Not authenticated"}, 401
-    if chat is None or (mod_token != game.mod_token and not read_perms):
+    if chat is None or (not is_mod and not read_perms):
         return {"message": "Chat not found"}, 404
     start = max(query.start, 0)
-    limit = 25 if query.limit < 0 else query.limit
-    return models.ChatMessagesResponseModel(
+    limit = min(25 if query.limit < 0 else query.limit, MAX_MESSAGE_LIMIT)
+    return models.ChatMessagesResponseModel.model_construct(
         chat_id=chat_id,
         total_messages=len(chat),
         messages=[
-            models.ChatMessageModel(
+            models.ChatMessageModel.model_construct(
                 author=str(msg.sender),
                 timestamp=getattr(msg, "timestamp", None),
                 content=msg.content,
             )
-            for idx, msg in enumerate(chat[start : start + limit])
+            for msg in chat[start : start + limit]
         ],
     )
 
 
 @api_bp.post("/games/<int:gid>/chats/<string:chat_id>")
 @api_bp.post("/games/<int:gid>/chats/<string:chat_id>/messages")
-@validate()  # type: ignore[misc]
-def game_chat_send_message(
-    gid: int,
+@validate()
+@game_view()
+def game_chat_send_message(  # noqa: PLR0913
+    game: Game,
     chat_id: str,
+    viewer: core.Player | None,
+    mod_token: str | None,
     body: models.ChatPostRequestModel,
+    *,
+    is_mod: bool,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Send a message to a chat."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    mod_token, player = get_permissions(game, request.headers)
     chat = game.chats.get(chat_id)
-    read_perms = False if chat is None else chat.has_read_perms(game, player)
-    write_perms = False if chat is None else chat.has_write_perms(game, player)
-    if mod_token is None and player is None and not read_perms and not write_perms:
+    read_perms = False if chat is None else chat.has_read_perms(game, viewer)
+    write_perms = False if chat is None else chat.has_write_perms(game, viewer)
+    if mod_token is None and viewer is None and not read_perms and not write_perms:
         return {"message": "Not authenticated"}, 401
-    if chat is None or (mod_token != game.mod_token and not read_perms):
+    if chat is None or (not is_mod and not read_perms):
         return {"message": "Chat not found"}, 404
-    if mod_token != game.mod_token and not write_perms:
+    if not is_mod and not write_perms:
         return {
             "message": "Not the moderator or player authorized to write to this chat",
         }, 403
     chat.send(
-        player.name if player is not None else "Moderator",
+        viewer.name if viewer is not None else "Moderator",
         body.content,
         type=ChatMessage,
     )
@@ -732,13 +680,11 @@ def game_chat_send_message(
 
 
 @api_bp.get("/games/<int:gid>/votes")
-@validate()  # type: ignore[misc]
-def game_votes(gid: int) -> models.GameVotesResponseModel | models.ErrorResponse:
+@validate()
+@game_view()
+def game_votes(game: Game) -> models.GameVotesResponseModel | models.ErrorResponse:
     """Get the votes in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    return models.GameVotesResponseModel(
+    return models.GameVotesResponseModel.model_construct(
         votes={
             p.name: v.name if (v := game.votes[p]) is not None else None
             for p in game.players
@@ -753,54 +699,34 @@ def game_votes(gid: int) -> models.GameVotesResponseModel | models.ErrorResponse
 
 
 @api_bp.post("/games/<int:gid>/players/<string:name>/vote")
-@validate()  # type: ignore[misc]
-def game_player_vote(  # noqa: PLR0911
-    gid: int,
-    name: str,
+@validate()
+@game_view(require="mod_or_player")
+def game_player_vote(
+    game: Game,
+    player: core.Player,
     body: models.PlayerVoteRequestModel,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Vote for a player in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player_auth is not player:
-        return {"message": "Not the moderator or the player"}, 403
     if not game.is_voting_phase():
         return {"message": "Not a voting phase"}, 400
     if body.target is None:
         game.vote(player, None)
     else:
-        target = next((p for p in game.alive_players if p.name == body.target), None)
-        if target is None:
+        target = game.players_by_name.get(body.target)
+        if target is None or not target.is_alive:
             return {"message": "Target not found"}, 404
         game.vote(player, target)
     return "", 204
 
 
 @api_bp.delete("/games/<int:gid>/players/<string:name>/vote")
-@validate()  # type: ignore[misc]
+@validate()
+@game_view(require="mod_or_player")
 def game_player_unvote(
-    gid: int,
-    name: str,
+    game: Game,
+    player: core.Player,
 ) -> models.EmptyResponse | models.ErrorResponse:
     """Unvote for a player in a game."""
-    if gid not in games:
-        return {"message": "Game not found"}, 404
-    game = games[gid]
-    player = next((p for p in game.players if p.name == name), None)
-    if player is None:
-        return {"message": "Player not found"}, 404
-    mod_token, player_auth = get_permissions(game, request.headers)
-    if mod_token is None and player_auth is None:
-        return {"message": "Not authenticated"}, 401
-    if mod_token != game.mod_token and player_auth is not player:
-        return {"message": "Not the moderator or the player"}, 403
     if not game.is_voting_phase():
         return {"message": "Not a voting phase"}, 400
     game.unvote(player)
@@ -808,40 +734,40 @@ def game_player_unvote(
 
 
 @api_bp.get("/reference/roles")
-@validate()  # type: ignore[misc]
+@validate()
 def roles_list() -> list[models.ObjectReferenceModel]:
     """Get the list of roles."""
     return [
-        models.ObjectReferenceModel(name=name, description=role.__doc__)
+        models.ObjectReferenceModel.model_construct(name=name, description=role.__doc__)
         for name, role in normal.ROLES.items()
     ]
 
 
 @api_bp.get("/reference/combined-roles")
-@validate()  # type: ignore[misc]
+@validate()
 def combined_roles_list() -> list[models.ObjectReferenceModel]:
     """Get the list of combined roles."""
     return [
-        models.ObjectReferenceModel(name=name, description=role.__doc__)
+        models.ObjectReferenceModel.model_construct(name=name, description=role.__doc__)
         for name, role in normal.COMBINED_ROLES.items()
     ]
 
 
 @api_bp.get("/reference/modifiers")
-@validate()  # type: ignore[misc]
+@validate()
 def modifiers_list() -> list[models.ObjectReferenceModel]:
     """Get the list of modifiers."""
     return [
-        models.ObjectReferenceModel(name=name, description=role.__doc__)
+        models.ObjectReferenceModel.model_construct(name=name, description=role.__doc__)
         for name, role in normal.MODIFIERS.items()
     ]
 
 
 @api_bp.get("/reference/alignments")
-@validate()  # type: ignore[misc]
+@validate()
 def alignments_list() -> list[models.ObjectReferenceModel]:
     """Get the list of alignments."""
     return [
-        models.ObjectReferenceModel(name=name, description=role.__doc__)
+        models.ObjectReferenceModel.model_construct(name=name, description=role.__doc__)
         for name, role in normal.ALIGNMENTS.items()
     ]
@@ -0,0 +1,78 @@
+"""Game lookup and authorization for API v1 endpoints.
+
+Views that act on a game share the same prologue: find the game, find the player named in
+the path, read the permission headers and check them.
+`game_view` does this once per request, before the view is called.
+"""
+
+from collections.abc import Callable
+from functools import wraps
+from inspect import signature
+from typing import Any, Literal
+
+from flask import request
+
+from mafia.api.core import games, get_permissions, request_lock
+
+Requirement = Literal["authenticated", "mod", "mod_or_player"]
+
+
+def game_view(
+    require: Requirement | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Look up the game of a view and check who is making the request.
+
+    The game is found from the `gid` path parameter, and the player from `name`.
+    Views get whichever of these keyword arguments they declare:
+
+    * `game`: the game.
+    * `player`: the player named in the path.
+    * `viewer`: the player making the request, from the player name header.
+    * `mod_token`: the moderator token header.
+    * `is_mod`: whether the moderator token is the game's.
+
+    The path parameters `gid` and `name` are also passed if the view declares them.
+    Views for requests that may modify the game are called with the game's lock held.
+    Responds with 404 if the game or player does not exist, and with 401 or 403 if the
+    request does not meet `require`:
+
+    * `"authenticated"`: a moderator token or player name was given.
+    * `"mod"`: the request is from the moderator.
+    * `"mod_or_player"`: the request is from the moderator or the player in the path.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        params = frozenset(signature(func).parameters)
+
+        @wraps(func)
+        def wrapper(**kwargs: Any) -> Any:
+            game = games.get(kwargs["gid"])
+            if game is None:
+                return {"message": "Game not found"}, 404
+            player = None
+            if "name" in kwargs:
+                player = game.players_by_name.get(kwargs["name"])
+                if player is None:
+                    return {"message": "Player not found"}, 404
+            mod_token, viewer = get_permissions(game, request.headers)
+            is_mod = mod_token == game.mod_token
+            if require is not None:
+                if mod_token is None and viewer is None:
+                    return {"message": "Not authenticated"}, 401
+                if require == "mod" and not is_mod:
+                    return {"message": "Not the moderator"}, 403
+                if require == "mod_or_player" and not is_mod and viewer is not player:
+                    return {"message": "Not the moderator or the player"}, 403
+            kwargs.update(
+                game=game,
+                player=player,
+                viewer=viewer,
+                mod_token=mod_token,
+                is_mod=is_mod,
+            )
+            with request_lock(game):
+                return func(**{k: v for k, v in kwargs.items() if k in params})
+
+        return wrapper
+
+    return decorate
@@ -3,9 +3,9 @@
 from collections.abc import Callable
 from datetime import datetime
 from enum import StrEnum
-from typing import Any, Literal, cast
+from typing import Annotated, Any, Literal, cast
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Discriminator, Field, Tag, field_validator
 from pydantic_core import PydanticCustomError
 
 from mafia import core, normal
@@ -55,7 +55,7 @@ class RoleModel(BaseModel):
 class CombinedRoleModel(BaseModel):
     node: Literal["combined_role"] = "combined_role"
     id: str
-    roles: list["RoleModel | ModifierModel"]
+    roles: list["CombinedRoleMemberModel"]
     params: dict[str, Any] = Field(default_factory=dict)
 
     @field_validator("id")
@@ -79,7 +79,7 @@ class CombinedRoleModel(BaseModel):
 class ModifierModel(BaseModel):
     node: Literal["modifier"] = "modifier"
     id: str
-    role: "RoleModel | CombinedRoleModel | ModifierModel"
+    role: "AnyRoleModel"
     params: dict[str, Any] = Field(default_factory=dict)
 
     @field_validator("id")
@@ -102,8 +102,34 @@ class ModifierModel(BaseModel):
         )
 
 
+def role_node(v: Any) -> str | None:
+    """Get the `node` of a role model, inferring it from the keys when it is omitted."""
+    if not isinstance(v, dict):
+        return getattr(v, "node", None)
+    node = v.get("node")
+    if isinstance(node, str):
+        return node
+    if "roles" in v:
+        return "combined_role"
+    if "role" in v:
+        return "modifier"
+    return "role"
+
+
+AnyRoleModel = Annotated[
+    Annotated[RoleModel, Tag("role")]
+    | Annotated[CombinedRoleModel, Tag("combined_role")]
+    | Annotated[ModifierModel, Tag("modifier")],
+    Discriminator(role_node),
+]
+CombinedRoleMemberModel = Annotated[
+    Annotated[RoleModel, Tag("role")] | Annotated[ModifierModel, Tag("modifier")],
+    Discriminator(role_node),
+]
+
+
 class GameCreateRequestRole(BaseModel):
-    role: RoleModel | CombinedRoleModel | ModifierModel
+    role: AnyRoleModel
     alignment: str
     role_params: dict[str, Any] = Field(default_factory=dict)
     alignment_id: str | None = None
@@ -136,6 +162,7 @@ class GameCreateRequestModel(BaseModel):
     chat_phases: list[Any] = Field(default_factory=lambda: [core.Phase.NIGHT])
     phase: Any | None = None
     shuffle_roles: bool = True
+    seed: int | None = None
     roles: list[GameCreateRequestRole]
 
 
@@ -0,0 +1,112 @@
+"""Request validation and response serialization for API v1 endpoints.
+
+A lightweight replacement for `flask_pydantic.validate`.
+The query and body models of each view are resolved once, when the view is decorated,
+instead of on every request. So is the adapter that serializes the lists it returns.
+"""
+
+from collections.abc import Callable
+from functools import wraps
+from types import UnionType
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+from flask import Response, request
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import ErrorDetails
+from werkzeug.exceptions import UnsupportedMediaType
+
+UNSUPPORTED_MEDIA_TYPE_MESSAGE = (
+    "Did not attempt to load JSON data because the request "
+    "Content-Type was not 'application/json'."
+)
+
+
+def validation_errors(error: ValidationError) -> list[ErrorDetails]:
+    """Get the errors of a validation error in a JSON-serializable form."""
+    errors = error.errors()
+    for e in errors:
+        if isinstance(e.get("input"), bytes):
+            e["input"] = e["input"].decode(errors="replace")
+        ctx = e.get("ctx")
+        if isinstance(ctx, dict) and isinstance(ctx.get("error"), Exception):
+            exc = ctx["error"]
+            ctx["error"] = {"type": type(exc).__name__, "message": str(exc)}
+    return errors
+
+
+def list_adapter(return_type: Any) -> TypeAdapter[list[Any]] | None:
+    """Get an adapter for the list type in the return annotation of a view, if any."""
+    if get_origin(return_type) in {Union, UnionType}:
+        candidates = get_args(return_type)
+    else:
+        candidates = (return_type,)
+    for candidate in candidates:
+        if get_origin(candidate) is list:
+            return TypeAdapter(candidate)
+    return None
+
+
+def json_response(
+    content: BaseModel | list[BaseModel],
+    status: int,
+    adapter: TypeAdapter[list[Any]] | None = None,
+) -> Response:
+    """Serialize a model, or a list of models, into a JSON response."""
+    if isinstance(content, BaseModel):
+        data: str | bytes = content.model_dump_json()
+    elif adapter is not None:
+        # Serializes the whole list in one call to pydantic-core.
+        data = adapter.dump_json(content)
+    else:
+        data = f"[{','.join(m.model_dump_json() for m in content)}]"
+    return Response(data, status, mimetype="application/json")
+
+
+def make_response(result: Any, adapter: TypeAdapter[list[Any]] | None = None) -> Any:
+    """Convert the return value of a view into a response if it contains models."""
+    content, status = result if isinstance(result, tuple) else (result, 200)
+    if isinstance(content, BaseModel) or (
+        isinstance(content, list) and all(isinstance(m, BaseModel) for m in content)
+    ):
+        return json_response(content, status, adapter)
+    return result
+
+
+def validate() -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Validate the `query` and `body` parameters of a view and serialize its result.
+
+    The parameters are validated against the models they are annotated with.
+    Path parameters are not validated again, as the URL converters already typed them.
+    Request bodies must be JSON and are validated directly from the raw request data.
+    Validation errors are returned as `{"validation_error": {...}}` with status 400.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        hints = get_type_hints(func)
+        query_model: type[BaseModel] | None = hints.get("query")
+        body_model: type[BaseModel] | None = hints.get("body")
+        adapter = list_adapter(hints.get("return"))
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            errors: dict[str, list[ErrorDetails]] = {}
+            if query_model is not None:
+                try:
+                    kwargs["query"] = query_model.model_validate(request.args.to_dict())
+                except ValidationError as e:
+                    errors["query_params"] = validation_errors(e)
+            if body_model is not None:
+                if not request.is_json:
+                    raise UnsupportedMediaType(UNSUPPORTED_MEDIA_TYPE_MESSAGE)
+                try:
+                    # Parse and validate in one step, without an intermediate dict.
+                    kwargs["body"] = body_model.model_validate_json(request.get_data())
+                except ValidationError as e:
+                    errors["body_params"] = validation_errors(e)
+            if errors:
+                return {"validation_error": errors}, 400
+            return make_response(func(*args, **kwargs), adapter)
+
+        return wrapper
+
+    return decorate
@@ -10,12 +10,20 @@ from collections.abc import Callable
 from logging import getLogger
 from pathlib import Path
 from pprint import pformat
+from threading import Thread
+from time import sleep
+from typing import Any, NoReturn
 
 from flask import Flask
+from flask.testing import FlaskClient
 
 from mafia import _status as status
 from mafia import core, normal
 from mafia.api import api_bp
+from mafia.api.core import MAX_MESSAGE_LIMIT, games
+from mafia.api.v1 import models
+from mafia.api.v1.auth import game_view
+from mafia.api.v1.validation import list_adapter
 from mafia.core import AbilityType, VisitStatus
 from mafia.normal import LoggingResolver
 
@@ -637,6 +645,29 @@ def test_api_v1() -> None:  # noqa: PLR0915
         assert response.json["players"][0]["name"] == "Alice"
         assert response.json["players"][0]["role_name"] == "Vanilla Townie"
 
+    with app.test_client() as client:
+        response = client.get(
+            f"/api/v1/games/{game_id}/players",
+            headers={"Authorization-Player-Name": "Eve"},
+        )
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        assert response.json is not None, "Expected JSON response"
+        assert "role" not in response.json[0], "Expected Alice's role to be hidden"
+        assert "role" in response.json[2], "Expected Eve to see their own role"
+
+    with app.test_client() as client:
+        response = client.get(
+            f"/api/v1/games/{game_id}/chats",
+            headers={"Authorization-Player-Name": "Alice"},
+        )
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        assert response.json is not None, "Expected JSON response"
+        chat_ids = [chat["id"] for chat in response.json]
+        assert "global" in chat_ids, "Expected Alice to see the global chat"
+        assert "faction:Mafia" not in chat_ids, "Expected the Mafia chat to be hidden"
+
     with app.test_client() as client:
         response = client.post(
             f"/api/v1/games/{game_id}/chats/global",
@@ -751,6 +782,18 @@ def test_api_v1() -> None:  # noqa: PLR0915
         )
         assert response.json is None, "Expected no JSON response"
 
+    with app.test_client() as client:
+        response = client.get(
+            f"/api/v1/games/{game_id}/players/Eve/abilities",
+            headers={"Authorization-Player-Name": "Eve"},
+        )
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        assert response.json is not None, "Expected JSON response"
+        shared_action = response.json["shared_actions"][0]
+        assert shared_action["used_by"] == "Eve", "Expected Eve to use the kill"
+        assert shared_action["queued"] == ["Alice"], "Expected Alice to be targeted"
+
     with app.test_client() as client:
         response = client.patch(
             f"/api/v1/games/{game_id}",
@@ -811,6 +854,745 @@ def test_api_v1() -> None:  # noqa: PLR0915
             "Expected 'Check failed for 'Doctor': Alice'"
         )
 
+    with app.test_client() as client:
+        response = client.post(
+            f"/api/v1/games/{game_id}/players/Bob/abilities",
+            json={
+                "actions": {
+                    "Doctor": {"targets": ["Mallory", "Alice", "Mallory"]},
+                },
+            },
+            headers={"Authorization-Player-Name": "Bob"},
+        )
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+            "Expected 400 Bad Request"
+        )
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["message"] == "Invalid targets for 'Doctor': Mallory", (
+            "Expected 'Invalid targets for 'Doctor': Mallory'"
+        )
+
+
+def test_api_v1_game_list() -> None:
+    r = LoggingResolver(logger)
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_ids = []
+        for _ in range(3):
+            response = client.post(
+                "/api/v1/games",
+                json={
+                    "players": ["Alice"],
+                    "roles": [{"role": {"id": "Vanilla"}, "alignment": "Town"}],
+                },
+            )
+            assert response.status_code == status.HTTP_201_CREATED, "Expected 201"
+            assert response.json is not None, "Expected JSON response"
+            game_ids.append((response.json["id"], response.json["mod_token"]))
+
+        response = client.delete(
+            f"/api/v1/games/{game_ids[1][0]}",
+            headers={"Authorization-Mod-Token": game_ids[1][1]},
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get("/api/v1/games", query_string={"limit": 1000})
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        assert response.json is not None, "Expected JSON response"
+        listed = [g["id"] for g in response.json["games"]]
+        assert listed == sorted(listed), "Expected games to be sorted by id"
+        assert game_ids[0][0] in listed, "Expected first game to be listed"
+        assert game_ids[1][0] not in listed, "Expected deleted game to be unlisted"
+        assert response.json["total_games"] == len(listed)
+
+        start = listed.index(game_ids[2][0])
+        response = client.get("/api/v1/games", query_string={"start": start, "limit": 1})
+        assert response.json is not None, "Expected JSON response"
+        assert [g["id"] for g in response.json["games"]] == [game_ids[2][0]]
+
+
+def test_api_v1_seeded_shuffle() -> None:
+    r = LoggingResolver(logger)
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    role_orders = []
+    with app.test_client() as client:
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/games",
+                json={
+                    "players": ["Alice", "Bob", "Carol", "Dave", "Eve"],
+                    "roles": [
+                        {"role": {"id": role}, "alignment": "Town"}
+                        for role in ("Vanilla", "Cop", "Doctor", "Tracker", "Watcher")
+                    ],
+                    "seed": 25,
+                },
+            )
+            assert response.status_code == status.HTTP_201_CREATED, "Expected 201"
+            assert response.json is not None, "Expected JSON response"
+            response = client.get(
+                f"/api/v1/games/{response.json['id']}",
+                headers={"Authorization-Mod-Token": response.json["mod_token"]},
+            )
+            r.logger.info("%s %s\n", response.status_code, response.json)
+            assert response.json is not None, "Expected JSON response"
+            role_orders.append([p["role"] for p in response.json["players"]])
+    assert role_orders[0] == role_orders[1], "Expected seeded shuffles to match"
+
+
+def test_api_v1_role_nodes() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice"],
+                "roles": [
+                    {
+                        "role": {"id": "Weak", "role": {"node": "role", "id": "Cop"}},
+                        "alignment": "Town",
+                    },
+                ],
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED, (
+            "Expected a modifier without a node to be inferred from its keys"
+        )
+
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice"],
+                "roles": [
+                    {
+                        "role": {"node": "modifier", "id": "Cop", "role": {"id": "Cop"}},
+                        "alignment": "Town",
+                    },
+                ],
+            },
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, "Expected 400"
+        assert response.json is not None, "Expected JSON response"
+        errors = response.json["validation_error"]["body_params"]
+        assert [e["loc"] for e in errors] == [["roles", 0, "role", "modifier", "id"]], (
+            "Expected only the tagged modifier branch to be validated"
+        )
+
+
+def test_api_v1_public_cache() -> None:
+    r = LoggingResolver(logger)
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Eve"],
+                "roles": [
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+                ],
+                "shuffle_roles": False,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["chats"] == [{"id": "global", "total_messages": 0}]
+
+        response = client.post(
+            f"/api/v1/games/{game_id}/chats/global",
+            json={"content": "Hello, world!"},
+            headers={"Authorization-Player-Name": "Alice"},
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        r.logger.info("%s %s\n", response.status_code, response.json)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["chats"] == [{"id": "global", "total_messages": 1}], (
+            "Expected cached view to be refreshed after a message"
+        )
+
+        response = client.get(
+            f"/api/v1/games/{game_id}",
+            headers={"Authorization-Player-Name": "Eve"},
+        )
+        assert response.json is not None, "Expected JSON response"
+        assert "faction:Mafia" in [c["id"] for c in response.json["chats"]], (
+            "Expected Eve to see the Mafia chat"
+        )
+        chats = {c["id"]: c["total_messages"] for c in response.json["chats"]}
+        mafia_messages = chats["faction:Mafia"]
+
+        response = client.post(
+            f"/api/v1/games/{game_id}/chats/faction:Mafia",
+            json={"content": "Hello, Mafia!"},
+            headers={"Authorization-Player-Name": "Eve"},
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(
+            f"/api/v1/games/{game_id}",
+            headers={"Authorization-Player-Name": "Eve"},
+        )
+        assert response.json is not None, "Expected JSON response"
+        chats = {c["id"]: c["total_messages"] for c in response.json["chats"]}
+        assert chats["faction:Mafia"] == mafia_messages + 1, (
+            "Expected Eve's cached view to be refreshed after a message"
+        )
+
+
+def test_api_v1_validation() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post("/api/v1/games", data="Alice", content_type="text/plain")
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, (
+            "Expected 415 for a body that is not JSON"
+        )
+
+        response = client.post(
+            "/api/v1/games", data='{"players": [', content_type="application/json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, "Expected 400"
+        assert response.json is not None, "Expected JSON response"
+        errors = response.json["validation_error"]["body_params"]
+        assert [e["type"] for e in errors] == ["json_invalid"], (
+            "Expected malformed JSON to be reported as a validation error"
+        )
+
+        response = client.get("/api/v1/games", query_string={"limit": "many"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, "Expected 400"
+        assert response.json is not None, "Expected JSON response"
+        errors = response.json["validation_error"]["query_params"]
+        assert [e["loc"] for e in errors] == [["limit"]], "Expected a query error"
+
+        response = client.get("/api/v1/reference/roles")
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        assert response.json is not None, "Expected JSON response"
+        assert {"name": "Vanilla", "description": "No abilities."} in response.json
+
+    adapter = list_adapter(list[models.ObjectReferenceModel] | models.ErrorResponse)
+    assert adapter is not None, "Expected an adapter for a list return type"
+    data = adapter.dump_json([models.ObjectReferenceModel(name="Vanilla")])
+    assert data == b'[{"name":"Vanilla","description":null}]', "Expected a JSON list"
+    assert list_adapter(models.GameResponseModel) is None, "Expected no list adapter"
+
+
+def test_api_v1_chat_perms() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Bob", "Eve"],
+                "roles": [
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+                ],
+                "shuffle_roles": False,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+        mod = {"Authorization-Mod-Token": response.json["mod_token"]}
+
+        response = client.get(f"/api/v1/games/{game_id}/chats/global", headers=mod)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["read_perms"] == ["Alice", "Bob", "Eve"]
+        assert response.json["write_perms"] == ["Alice", "Bob", "Eve"], (
+            "Expected everyone to be able to talk during the day"
+        )
+
+        response = client.patch(
+            f"/api/v1/games/{game_id}", json={"actions": ["next_phase"]}, headers=mod
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(f"/api/v1/games/{game_id}/chats/global", headers=mod)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["read_perms"] == ["Alice", "Bob", "Eve"]
+        assert response.json["write_perms"] == [], (
+            "Expected the cached permissions to be refreshed at night"
+        )
+
+
+def create_v0_game(client: FlaskClient) -> tuple[int, dict[str, str]]:
+    """Create a game with a Cop, a Vanilla Townie and a Mafia Goon for the v0 tests.
+
+    Returns the game id and the moderator's headers.
+    """
+    response = client.post(
+        "/api/v1/games",
+        json={
+            "players": ["Alice", "Bob", "Eve"],
+            "roles": [
+                {"role": {"id": "Cop"}, "alignment": "Town"},
+                {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+            ],
+            "shuffle_roles": False,
+        },
+    )
+    assert response.json is not None, "Expected JSON response"
+    return response.json["id"], {"Authorization-Mod-Token": response.json["mod_token"]}
+
+
+V0_ALICE = {"Authorization-Player-Name": "Alice"}
+V0_EVE = {"Authorization-Player-Name": "Eve"}
+
+
+def v0_player(
+    name: str, role: str | None = None, alignment: str = "Town"
+) -> dict[str, Any]:
+    """Get a player as listed by API v0, with their role if it is shown."""
+    if role is None:
+        return {"is_alive": True, "name": name}
+    role_name = {"Cop": f"{alignment} Cop", "Vanilla": "Vanilla Townie"}[role]
+    return {
+        "alignment": alignment,
+        "is_alive": True,
+        "name": name,
+        "role": role,
+        "role_name": role_name,
+        "role_name_html": (
+            f'<span class="role_name Alignment-{alignment}">{role_name}</span>'
+        ),
+    }
+
+
+def test_api_v0_players_abilities() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, mod = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}"
+
+        response = client.get(f"{url}/players", headers=V0_ALICE)
+        assert response.json == [
+            v0_player("Alice", "Cop"),
+            v0_player("Bob"),
+            v0_player("Eve"),
+        ], "Expected Alice to see only her own role"
+
+        cop = {
+            "id": "Cop",
+            "immediate": False,
+            "phase": "NIGHT",
+            "queued": None,
+            "target_count": 1,
+            "targets": [],
+        }
+        response = client.get(f"{url}/players/Alice/abilities", headers=V0_ALICE)
+        assert response.json == {"actions": [cop], "passives": [], "shared_actions": []}
+
+        response = client.patch(url, json={"actions": ["next_phase"]}, headers=mod)
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+        response = client.get(f"{url}/players/Alice/abilities", headers=V0_ALICE)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["actions"] == [cop | {"targets": [["Bob"], ["Eve"]]}], (
+            "Expected the cached abilities to be refreshed at night"
+        )
+
+        response = client.post(
+            f"{url}/players/Eve/abilities",
+            json={"shared_actions": {"Mafia Factional Kill": ["Bob"]}},
+            headers=V0_EVE,
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+        response = client.patch(
+            url, json={"actions": ["dequeue", "resolve"]}, headers=mod
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(f"{url}/players", headers=V0_ALICE)
+        assert response.json == [
+            v0_player("Alice", "Cop"),
+            v0_player("Bob", "Vanilla") | {"is_alive": False},
+            v0_player("Eve"),
+        ], "Expected the cached player list to show Bob's death"
+
+
+def test_api_v0_game_chats() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, _ = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}"
+
+        response = client.get(url, headers=V0_ALICE)
+        assert response.json == {
+            "chats": [{"id": "global", "message_count": 0}],
+            "day_no": 1,
+            "game_id": game_id,
+            "phase": "DAY",
+            "players": [v0_player("Alice", "Cop"), v0_player("Bob"), v0_player("Eve")],
+        }
+        response = client.get(f"{url}/chats", headers=V0_ALICE)
+        assert response.json == [{"id": "global", "message_count": 0}]
+
+        response = client.post(
+            f"{url}/chats/global", json={"content": "Hello!"}, headers=V0_ALICE
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(url, headers=V0_ALICE)
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["chats"] == [{"id": "global", "message_count": 1}], (
+            "Expected the cached game view to count the new message"
+        )
+        response = client.get(f"{url}/chats", headers=V0_ALICE)
+        assert response.json == [{"id": "global", "message_count": 1}], (
+            "Expected the cached chat list to count the new message"
+        )
+
+
+def test_api_v0_moderator_chats() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, mod = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}/chats"
+
+        response = client.get(url, headers=V0_ALICE)
+        assert response.json == [{"id": "global", "message_count": 0}]
+        response = client.get(url, headers=V0_EVE)
+        assert response.json == [
+            {"id": "global", "message_count": 0},
+            {"id": "faction:Mafia", "message_count": 1},
+        ], "Expected Eve to see the Mafia chat"
+        response = client.get(url, headers=mod)
+        assert response.json == [
+            {"id": "global", "message_count": 0},
+            {"id": "faction:Mafia", "message_count": 1},
+        ], "Expected the moderator to see every chat"
+
+
+def test_api_v0_chat() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, mod = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}"
+
+        response = client.get(f"{url}/chats/global", headers=V0_ALICE)
+        assert response.json == {
+            "chat_id": "global",
+            "read_perms": ["Alice", "Bob", "Eve"],
+            "total_messages": 0,
+            "write_perms": ["Alice", "Bob", "Eve"],
+        }
+
+        response = client.post(
+            f"{url}/chats/global", json={"content": "Hello!"}, headers=V0_ALICE
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+        response = client.patch(url, json={"actions": ["next_phase"]}, headers=mod)
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(f"{url}/chats/global", headers=V0_ALICE)
+        assert response.json == {
+            "chat_id": "global",
+            "read_perms": ["Alice", "Bob", "Eve"],
+            "total_messages": 1,
+            "write_perms": [],
+        }, "Expected the cached chat summary to be refreshed"
+
+
+def test_api_v0_etag() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, _ = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}"
+
+        response = client.get(url, headers=V0_ALICE)
+        assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+        etag = response.headers["ETag"]
+
+        response = client.get(url, headers=V0_ALICE | {"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED, "Expected 304"
+        assert response.data == b"", "Expected an empty 304 response"
+
+        response = client.post(
+            f"{url}/chats/global", json={"content": "Hello!"}, headers=V0_ALICE
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(url, headers=V0_ALICE | {"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK, (
+            "Expected 200 OK after the game changed"
+        )
+        assert response.headers["ETag"] != etag, "Expected a new ETag"
+
+
+def test_api_v0_message_paging() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, mod = create_v0_game(client)
+        url = f"/api/v0/games/{game_id}"
+        contents = ("a", "b", "c")
+        for content in contents:
+            client.post(f"{url}/chats/global", json={"content": content}, headers=mod)
+            client.post(
+                f"{url}/players/Alice/messages", json={"content": content}, headers=mod
+            )
+
+        for messages_url in (
+            f"{url}/chats/global/messages",
+            f"{url}/players/Alice/messages",
+        ):
+            for arg in ("start", "limit"):
+                response = client.get(messages_url, query_string={arg: "x"}, headers=mod)
+                assert response.status_code == status.HTTP_400_BAD_REQUEST, (
+                    f"Expected 400 for a non-integer {arg}"
+                )
+
+            response = client.get(
+                messages_url, query_string={"start": 1, "limit": 1}, headers=mod
+            )
+            assert response.status_code == status.HTTP_200_OK, "Expected 200 OK"
+            assert response.json is not None, "Expected JSON response"
+            assert response.json["messages"] == [
+                {"author": "Moderator", "content": "b", "timestamp": 1}
+            ], "Expected message indexes to count from the start of the chat"
+            assert response.json["total_messages"] == len(contents)
+
+
+def test_api_v0_message_clamping() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        game_id, mod = create_v0_game(client)
+        total = MAX_MESSAGE_LIMIT + 10
+        for i in range(total):
+            client.post(
+                f"/api/v0/games/{game_id}/chats/global",
+                json={"content": str(i)},
+                headers=mod,
+            )
+            client.post(
+                f"/api/v0/games/{game_id}/players/Alice/messages",
+                json={"content": str(i)},
+                headers=mod,
+            )
+
+        pages: list[tuple[dict[str, int], range]] = [
+            ({"start": -2}, range(25)),
+            ({"limit": -1}, range(25)),
+            ({"limit": 10**9}, range(MAX_MESSAGE_LIMIT)),
+            ({"start": total - 5, "limit": 10**9}, range(total - 5, total)),
+            ({"start": 10**9}, range(0)),
+        ]
+        for path in ("chats/global/messages", "players/Alice/messages"):
+            for query, expected in pages:
+                response = client.get(
+                    f"/api/v0/games/{game_id}/{path}", query_string=query, headers=mod
+                )
+                assert response.json is not None, "Expected JSON response"
+                messages = response.json["messages"]
+                assert [m["timestamp"] for m in messages] == list(expected), (
+                    f"Expected {query} to be clamped to messages {expected}"
+                )
+                assert [m["content"] for m in messages] == [str(i) for i in expected]
+
+                response = client.get(
+                    f"/api/v1/games/{game_id}/{path}", query_string=query, headers=mod
+                )
+                assert response.json is not None, "Expected JSON response"
+                assert [m["content"] for m in response.json["messages"]] == [
+                    str(i) for i in expected
+                ], f"Expected {query} to be clamped the same way in API v1"
+
+
+def test_api_failed_write() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+
+    @app.post("/games/<int:gid>/players/<string:name>/kill")
+    @game_view(require="mod")
+    def kill_then_fail(player: core.Player) -> NoReturn:
+        player.kill("Test")
+        msg = "Failed after changing the game"
+        raise RuntimeError(msg)
+
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Eve"],
+                "roles": [
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+                ],
+                "shuffle_roles": False,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+        mod = {"Authorization-Mod-Token": response.json["mod_token"]}
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["players"][0]["is_alive"], "Expected Alice to be alive"
+
+        response = client.post(f"/games/{game_id}/players/Alice/kill", headers=mod)
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR, (
+            "Expected 500"
+        )
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        assert response.json is not None, "Expected JSON response"
+        assert not response.json["players"][0]["is_alive"], (
+            "Expected a failed write to invalidate the cached view"
+        )
+
+
+def test_api_direct_change() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Eve"],
+                "roles": [
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+                ],
+                "shuffle_roles": False,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["players"][0]["is_alive"], "Expected Alice to be alive"
+
+        game = games[game_id]
+        game.players_by_name["Alice"].kill("Test")
+        game.bump_version()
+
+        response = client.get(f"/api/v1/games/{game_id}")
+        assert response.json is not None, "Expected JSON response"
+        assert not response.json["players"][0]["is_alive"], (
+            "Expected bump_version to invalidate the cached view"
+        )
+
+
+def test_api_valid_targets_cache() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Bob", "Carol", "Eve"],
+                "roles": [
+                    {"role": {"id": "Cop"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Town"},
+                    {"role": {"id": "Vanilla"}, "alignment": "Mafia"},
+                ],
+                "shuffle_roles": False,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+        mod = {"Authorization-Mod-Token": response.json["mod_token"]}
+        client.patch(
+            f"/api/v1/games/{game_id}", json={"actions": ["next_phase"]}, headers=mod
+        )
+
+        response = client.get(
+            f"/api/v1/games/{game_id}/players/Alice/abilities", headers=mod
+        )
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["actions"][0]["targets"] == [["Bob"], ["Carol"], ["Eve"]]
+        client.get(f"/api/v1/games/{game_id}")
+
+        response = client.post(
+            f"/api/v1/games/{game_id}/players/Eve/abilities",
+            json={"shared_actions": {"Mafia Factional Kill": {"targets": ["Bob"]}}},
+            headers=mod,
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+        response = client.patch(
+            f"/api/v1/games/{game_id}",
+            json={"actions": ["dequeue", "resolve"]},
+            headers=mod,
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+        response = client.get(
+            f"/api/v1/games/{game_id}/players/Alice/abilities", headers=mod
+        )
+        assert response.json is not None, "Expected JSON response"
+        assert response.json["actions"][0]["targets"] == [["Carol"], ["Eve"]], (
+            "Expected the cached valid targets to drop the killed player"
+        )
+        game = games[game_id]
+        assert all(v == game.version for v, _ in game.response_cache.values()), (
+            "Expected values cached for earlier versions to be discarded"
+        )
+
+
+def test_api_write_lock() -> None:
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    events: list[tuple[str, str]] = []
+
+    @app.post("/games/<int:gid>/players/<string:name>/slow")
+    @game_view(require="mod")
+    def slow_write(name: str) -> tuple[str, int]:
+        events.append(("start", name))
+        sleep(0.05)
+        events.append(("end", name))
+        return "", status.HTTP_204_NO_CONTENT
+
+    with app.test_client() as client:
+        response = client.post(
+            "/api/v1/games",
+            json={
+                "players": ["Alice", "Bob"],
+                "roles": [{"role": {"id": "Vanilla"}, "alignment": "Town"}] * 2,
+            },
+        )
+        assert response.json is not None, "Expected JSON response"
+        game_id = response.json["id"]
+        mod = {"Authorization-Mod-Token": response.json["mod_token"]}
+
+    def write(name: str) -> None:
+        with app.test_client() as client:
+            response = client.post(f"/games/{game_id}/players/{name}/slow", headers=mod)
+            assert response.status_code == status.HTTP_204_NO_CONTENT, "Expected 204"
+
+    threads = [Thread(target=write, args=(name,)) for name in ("Alice", "Bob")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    first, second = events[0][1], events[2][1]
+    assert events == [
+        ("start", first),
+        ("end", first),
+        ("start", second),
+        ("end", second),
+    ], "Expected concurrent writes to the same game to run one after the other"
+
 
 def test_voting() -> None:
     r = LoggingResolver(logger)
@@ -862,5 +1644,22 @@ TESTS: dict[str, Callable[[], None]] = {
     "personal": test_personal,
     "combine": test_combine,
     "api_v1": test_api_v1,
+    "api_v1_game_list": test_api_v1_game_list,
+    "api_v1_seeded_shuffle": test_api_v1_seeded_shuffle,
+    "api_v1_role_nodes": test_api_v1_role_nodes,
+    "api_v1_public_cache": test_api_v1_public_cache,
+    "api_v1_validation": test_api_v1_validation,
+    "api_v1_chat_perms": test_api_v1_chat_perms,
+    "api_v0_players_abilities": test_api_v0_players_abilities,
+    "api_v0_game_chats": test_api_v0_game_chats,
+    "api_v0_moderator_chats": test_api_v0_moderator_chats,
+    "api_v0_chat": test_api_v0_chat,
+    "api_v0_etag": test_api_v0_etag,
+    "api_v0_message_paging": test_api_v0_message_paging,
+    "api_v0_message_clamping": test_api_v0_message_clamping,
+    "api_failed_write": test_api_failed_write,
+    "api_direct_change": test_api_direct_change,
+    "api_valid_targets_cache": test_api_valid_targets_cache,
+    "api_write_lock": test_api_write_lock,
     "voting": test_voting,
 }